@@ -8,6 +8,7 @@ Usage:
     python3 download_images.py <URL> <directory> [filenames]
     python3 download_images.py <URL> <directory> -r <range>
     python3 download_images.py <URL> <directory> -r <range> -s <suffix>
+    python3 download_images.py <URL> <directory> -j <jobs>
     
 Examples:
     python3 download_images.py 'https://example.com' 'images'
@@ -21,17 +22,97 @@ import sys
 import os
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import hashlib
-import re
-from bs4 import BeautifulSoup
+import io
+import threading
+import functools
+import lxml.etree
+import lxml.html
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Optional: drop-in replacement for re with a faster matching engine
+try:
+    import regex as re
+except ImportError:
+    import re
+
+# Optional: faster JSON serialization for large metadata files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Number of images downloaded concurrently
+DEFAULT_JOBS = 8
+
+# Read size for streaming response bodies
+CHUNK_SIZE = 64 * 1024
+
+# Completed downloads between progress output flushes
+FLUSH_EVERY = 10
+
+# Hosts kept in the keep-alive connection pool
+POOL_CONNECTIONS = 32
+
+# Extensions treated as direct image URLs
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+
+@functools.lru_cache(maxsize=1024)
+def split_url(url):
+    """Split a URL into (base_url, filename), dropping query and fragment"""
+    parsed = urlparse(url)
+    path = parsed.path
+    
+    # Extract filename from path
+    filename = os.path.basename(path)
+    base_path = os.path.dirname(path) + '/'
+    
+    # Reconstruct base URL
+    return f"{parsed.scheme}://{parsed.netloc}{base_path}", filename
+
+
+@functools.lru_cache(maxsize=None)
+def numeric_filename_pattern(suffix=None):
+    """
+    Compile the numeric filename patterns into one regex, in priority order
+    
+    Every alternative is a named group followed by four groups:
+    (prefix, number, suffix, extension). Empty groups keep the layout uniform.
+    See ImageDownloader.extract_numeric_pattern for the pattern descriptions.
+    """
+    alternatives = []
+    
+    if suffix:
+        # Escape special regex characters in suffix
+        escaped_suffix = re.escape(suffix)
+        alternatives += [
+            # prefix_01_500.jpg: prefix ends with underscore before the number
+            ('suffix', rf'(.+_)(\d+)({escaped_suffix})(\.\w+)'),
+            # prefixABC01_500.jpg: prefix ends with a letter
+            ('suffix_letter', rf'(.+[a-zA-Z])(\d+)({escaped_suffix})(\.\w+)'),
+        ]
+    
+    alternatives += [
+        # prefix_01.jpg
+        ('underscore', r'(.+_)(\d+)()(\.\w+)'),
+        # jsuetrki00.jpg
+        ('letter_number', r'(.+[a-zA-Z])(\d+)()(\.\w+)'),
+        # 685.jpg
+        ('simple', r'()(\d+)()(\.\w+)'),
+    ]
+    
+    return re.compile('^(?:' + '|'.join(f'(?P<{name}>{body})' for name, body in alternatives) + ')$')
 
 
 class ImageDownloader:
-    def __init__(self, url, directory, filenames=None, range_count=None, suffix=None, verbose=True):
+    def __init__(self, url, directory, filenames=None, range_count=None, suffix=None, verbose=True,
+                 jobs=DEFAULT_JOBS):
         """
         Initialize the image downloader
         
@@ -42,19 +123,37 @@ class ImageDownloader:
             range_count: Number of images to download in range mode
             suffix: Optional suffix after the number (e.g., '_500')
             verbose: Print detailed output
+            jobs: Number of concurrent downloads
         """
         self.url = url
         self.directory = directory
+        self._dir = Path(directory)
         self.filenames = self._parse_filenames(filenames)
         self.range_count = range_count
         self.suffix = suffix
         self.verbose = verbose
+        self.jobs = max(1, jobs)
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Connection': 'keep-alive'
         })
+        # Reuse connections across concurrent downloads and retry transient errors.
+        # Images usually come from a single host, so one keep-alive connection
+        # per worker is all that is ever needed.
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=self.jobs,
+            pool_block=True,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.metadata = []  # Store metadata for each downloaded image
         self.is_range_mode = False
+        self._print_lock = threading.Lock()
+        self._output = io.StringIO()  # Buffered progress output, see _flush
     
     def _parse_filenames(self, filenames):
         """Parse comma-separated filenames into a list"""
@@ -63,9 +162,22 @@ class ImageDownloader:
         return [name.strip() for name in filenames.split(',') if name.strip()]
     
     def _print(self, message, end='\n'):
-        """Print message if verbose mode is enabled"""
+        """Buffer message for output if verbose mode is enabled"""
         if self.verbose:
-            print(message, end=end)
+            # Downloads report from worker threads; keep each message on its own line
+            with self._print_lock:
+                self._output.write(message)
+                self._output.write(end)
+    
+    def _flush(self):
+        """Write buffered messages to stdout in one call"""
+        with self._print_lock:
+            output = self._output.getvalue()
+            self._output.seek(0)
+            self._output.truncate()
+        if output:
+            sys.stdout.write(output)
+            sys.stdout.flush()
     
     def calculate_sha256(self, filepath):
         """Calculate SHA256 checksum of a file"""
@@ -78,10 +190,8 @@ class ImageDownloader:
     
     def is_direct_image_url(self, url):
         """Check if URL points directly to an image file"""
-        image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        return any(path.endswith(ext) for ext in image_extensions)
+        _, filename = split_url(url)
+        return filename.lower().endswith(IMAGE_EXTENSIONS)
     
     def extract_numeric_pattern(self, url):
         """
@@ -107,129 +217,54 @@ class ImageDownloader:
             Input: https://storage.googleapis.com/.../685.jpg
             Output: ('https://storage.googleapis.com/.../', '', 685, '', '.jpg', 3, 'simple')
         """
-        parsed = urlparse(url)
-        path = parsed.path
-        
-        # Extract filename from path
-        filename = os.path.basename(path)
-        base_path = os.path.dirname(path) + '/'
+        base_url, filename = split_url(url)
         
-        # Reconstruct base URL
-        base_url = f"{parsed.scheme}://{parsed.netloc}{base_path}"
-        
-        # Pattern 0: Suffix pattern (when --suffix is provided) - Highest priority
-        # Match: prefix_01_500.jpg where _500 is the user-provided suffix
-        if self.suffix:
-            # Escape special regex characters in suffix
-            escaped_suffix = re.escape(self.suffix)
-            
-            # Build pattern: (.+_)(digits)(suffix)(.ext)
-            # Prefix must end with underscore before the number
-            pattern = rf'^(.+_)(\d+)({escaped_suffix})(\.\w+)$'
-            match_suffix = re.match(pattern, filename)
-            
-            if match_suffix:
-                prefix = match_suffix.group(1)
-                number_str = match_suffix.group(2)
-                number = int(number_str)
-                suffix_matched = match_suffix.group(3)
-                extension = match_suffix.group(4)
-                digit_width = len(number_str)
-                
-                return (base_url, prefix, number, suffix_matched, extension, digit_width, 'suffix')
-            
-            # Also try pattern without underscore before number
-            # Match: prefixABC01_500.jpg
-            pattern2 = rf'^(.+[a-zA-Z])(\d+)({escaped_suffix})(\.\w+)$'
-            match_suffix2 = re.match(pattern2, filename)
-            
-            if match_suffix2:
-                prefix = match_suffix2.group(1)
-                number_str = match_suffix2.group(2)
-                number = int(number_str)
-                suffix_matched = match_suffix2.group(3)
-                extension = match_suffix2.group(4)
-                digit_width = len(number_str)
-                
-                return (base_url, prefix, number, suffix_matched, extension, digit_width, 'suffix')
-        
-        # Pattern 1: filename_number.ext (underscore pattern)
-        # Match: prefix_01.jpg, file_name_123.png, etc.
-        # Must have underscore immediately before number
-        match_underscore = re.match(r'^(.+_)(\d+)(\.\w+)$', filename)
-        
-        if match_underscore:
-            prefix = match_underscore.group(1)
-            number_str = match_underscore.group(2)
-            number = int(number_str)
-            extension = match_underscore.group(3)
-            digit_width = len(number_str)
-            
-            return (base_url, prefix, number, '', extension, digit_width, 'underscore')
-        
-        # Pattern 2: prefix[letters]number.ext (letter-number pattern)
-        # Match: jsuetrki00.jpg, photo123.png, etc.
-        # Must end with letter(s) followed by number(s)
-        match_letter_number = re.match(r'^(.+[a-zA-Z])(\d+)(\.\w+)$', filename)
-        
-        if match_letter_number:
-            prefix = match_letter_number.group(1)
-            number_str = match_letter_number.group(2)
-            number = int(number_str)
-            extension = match_letter_number.group(3)
-            digit_width = len(number_str)
-            
-            return (base_url, prefix, number, '', extension, digit_width, 'letter_number')
+        # Single pass over the filename; the first matching alternative wins
+        match = numeric_filename_pattern(self.suffix).match(filename)
+        if not match:
+            return None
         
-        # Pattern 3: number.ext (simple pattern)
-        # Match: 685.jpg, 001.png, etc.
-        # Pure numeric filename
-        match_simple = re.match(r'^(\d+)(\.\w+)$', filename)
+        pattern_name = match.lastgroup
+        index = match.re.groupindex[pattern_name]
+        prefix, number_str, suffix_matched, extension = match.groups()[index:index + 4]
+        pattern_type = 'suffix' if pattern_name == 'suffix_letter' else pattern_name
         
-        if match_simple:
-            number_str = match_simple.group(1)
-            number = int(number_str)
-            extension = match_simple.group(2)
-            digit_width = len(number_str)
-            
-            return (base_url, '', number, '', extension, digit_width, 'simple')
-        
-        return None
+        return (base_url, prefix, int(number_str), suffix_matched, extension, len(number_str), pattern_type)
     
     def generate_range_urls(self, base_url, prefix, start_number, suffix, extension, count, digit_width):
         """Generate URLs for range download"""
-        urls = []
-        for i in range(count):
-            number = start_number + i
-            # Format with leading zeros if original had them
-            number_str = str(number).zfill(digit_width)
-            
-            # Construct filename based on pattern
-            filename = f"{prefix}{number_str}{suffix}{extension}"
-            
-            url = f"{base_url}{filename}"
-            urls.append(url)
-        return urls
+        def escape(text):
+            return text.replace('{', '{{').replace('}', '}}')
+        
+        # Build the URL template once; the number keeps leading zeros if the original had them
+        url_format = f"{escape(base_url + prefix)}{{:0{digit_width}d}}{escape(suffix + extension)}"
+        return list(map(url_format.format, range(start_number, start_number + count)))
     
     def fetch_page(self):
         """Fetch the webpage content"""
         self._print("Fetching webpage...")
+        self._flush()
         try:
             response = self.session.get(self.url, timeout=30)
             response.raise_for_status()
             self._print(f"✓ Successfully fetched page (Status: {response.status_code})")
-            return response.text
+            # Raw bytes, so lxml honours the page's own encoding declaration
+            return response.content
         except requests.exceptions.RequestException as e:
             self._print(f"✗ Error fetching page: {e}")
             sys.exit(1)
     
     def extract_image_urls(self, html):
-        """Extract image URLs from HTML using BeautifulSoup"""
+        """Extract image URLs from HTML using lxml"""
         self._print("Parsing HTML...")
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Find images: #subphotoimg > li > .imgBig
-        images = soup.select('#subphotoimg > li > .imgBig')
+        try:
+            document = lxml.html.fromstring(html)
+        except lxml.etree.ParserError:
+            # Empty or unparseable page
+            images = []
+        else:
+            # Find images: #subphotoimg > li > .imgBig
+            images = document.cssselect('#subphotoimg > li > .imgBig')
         
         if not images:
             self._print("✗ No images found with selector '#subphotoimg > li > .imgBig'")
@@ -299,7 +334,7 @@ class ImageDownloader:
     
     def create_directory(self):
         """Create the target directory if it doesn't exist"""
-        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        self._dir.mkdir(parents=True, exist_ok=True)
         self._print(f"✓ Directory created/verified: {self.directory}")
     
     def get_filename(self, url, index):
@@ -310,41 +345,80 @@ class ImageDownloader:
             # Extract filename from URL, remove query parameters
             return os.path.basename(url).split('?')[0]
     
+    def probe_image(self, url):
+        """Check with a HEAD request whether an image exists before downloading it"""
+        try:
+            response = self.session.head(url, timeout=30, allow_redirects=True)
+        except requests.exceptions.RequestException:
+            # Inconclusive; let the download itself report the error
+            return True
+        # Servers that reject HEAD (e.g. 405) still get a GET
+        return response.status_code not in (404, 410)
+    
+    def _preallocate(self, f, response):
+        """Reserve disk space for a response body of known length, return bytes reserved"""
+        # Content-Length is the encoded size, so only trust it for unencoded bodies
+        if not hasattr(os, 'posix_fallocate'):
+            return 0
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            return 0
+        try:
+            length = int(response.headers.get('Content-Length', 0))
+            if length > 0:
+                os.posix_fallocate(f.fileno(), 0, length)
+                return length
+        except (ValueError, OSError):
+            pass
+        return 0
+    
     def download_image(self, url, filepath, index, total):
-        """Download a single image and collect metadata"""
+        """Download a single image and return its metadata entry, or None on failure"""
         filename = os.path.basename(filepath)
-        self._print(f"[{index + 1}/{total}] Downloading: {filename}... ", end='')
+        progress = f"[{index + 1}/{total}] Downloading: {filename}..."
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            # Stream the body to disk instead of buffering the whole image,
+            # hashing each chunk as it is written so the file is never re-read.
+            # hashlib releases the GIL on large updates, so hashing already
+            # runs in parallel across the download threads.
+            sha256_hash = hashlib.sha256()
+            size = 0
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                
+                with open(filepath, 'wb') as f:
+                    reserved = self._preallocate(f, response)
+                    # iter_content rather than raw.readinto(): urllib3 2.x implements
+                    # readinto as read() plus a copy, and reading response.raw
+                    # skips requests' exception wrapping
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        sha256_hash.update(chunk)
+                        size += len(chunk)
+                    
+                    # Drop any reserved space the body did not fill
+                    if size < reserved:
+                        f.truncate(size)
             
-            size = os.path.getsize(filepath)
             size_str = self._format_size(size)
+            sha256 = sha256_hash.hexdigest()
             
-            # Calculate SHA256
-            sha256 = self.calculate_sha256(filepath)
+            self._print(f"{progress} ✓ Done ({size_str})")
             
-            # Store metadata (without size_human)
-            self.metadata.append({
+            # Metadata entry (without size_human)
+            return {
                 "file": filename,
                 "source": url,
                 "sha256": sha256,
                 "size": size
-            })
-            
-            self._print(f"✓ Done ({size_str})")
-            return True
+            }
             
         except requests.exceptions.RequestException as e:
-            self._print(f"✗ Failed: {e}")
-            return False
+            self._print(f"{progress} ✗ Failed: {e}")
+            return None
         except Exception as e:
-            self._print(f"✗ Error: {e}")
-            return False
+            self._print(f"{progress} ✗ Error: {e}")
+            return None
     
     def _format_size(self, size):
         """Format file size in human-readable format"""
@@ -357,7 +431,7 @@ class ImageDownloader:
     
     def save_metadata(self):
         """Save metadata to JSON file"""
-        metadata_path = os.path.join(self.directory, 'metadata.json')
+        metadata_path = self._dir / 'metadata.json'
         
         # Get current UTC time with timezone info
         utc_now = datetime.now(timezone.utc)
@@ -371,8 +445,12 @@ class ImageDownloader:
         }
         
         try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata_output, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(metadata_path, 'wb') as f:
+                    f.write(orjson.dumps(metadata_output, option=orjson.OPT_INDENT_2))
+            else:
+                with open(metadata_path, 'w', encoding='utf-8') as f:
+                    json.dump(metadata_output, f, indent=2, ensure_ascii=False)
             
             self._print(f"✓ Metadata saved to: {metadata_path}")
             return True
@@ -382,6 +460,13 @@ class ImageDownloader:
     
     def download_all(self):
         """Main download process"""
+        try:
+            return self._download_all()
+        finally:
+            self._flush()
+    
+    def _download_all(self):
+        """Download process body; output is flushed at phase boundaries"""
         self._print("=" * 60)
         self._print("Image Downloader")
         self._print("=" * 60)
@@ -401,30 +486,55 @@ class ImageDownloader:
         
         # Create directory
         self.create_directory()
+        self._flush()
         
         # Get image URLs
         image_urls = self.get_image_urls()
         
         self._print("")
-        self._print("Starting downloads...")
+        self._print(f"Starting downloads ({self.jobs} concurrent)...")
         self._print("=" * 60)
-        
-        # Download images
-        success_count = 0
-        failed_count = 0
-        
-        for i, url in enumerate(image_urls):
-            filename = self.get_filename(url, i)
-            filepath = os.path.join(self.directory, filename)
-            
-            if self.download_image(url, filepath, i, len(image_urls)):
-                success_count += 1
-            else:
-                failed_count += 1
+        self._flush()
+        
+        # Download images concurrently; the work is bound by network I/O
+        total = len(image_urls)
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            try:
+                # Generated range URLs may overshoot the real set; probe them
+                # with HEAD first so missing images cost no GET
+                if self.is_range_mode:
+                    exists = list(executor.map(self.probe_image, image_urls))
+                else:
+                    exists = [True] * total
+                
+                futures = []
+                for i, url in enumerate(image_urls):
+                    filename = self.get_filename(url, i)
+                    if exists[i]:
+                        futures.append(executor.submit(self.download_image, url,
+                                                       self._dir / filename,
+                                                       i, total))
+                    else:
+                        self._print(f"[{i + 1}/{total}] Downloading: {filename}... ✗ Not found")
+                
+                for done, _ in enumerate(as_completed(futures), 1):
+                    if done % FLUSH_EVERY == 0:
+                        self._flush()
+                results = [future.result() for future in futures]
+            except BaseException:
+                # Drop queued probes and downloads so Ctrl-C stops the run promptly
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        
+        # Keep metadata in URL order regardless of completion order
+        self.metadata.extend(entry for entry in results if entry is not None)
+        success_count = len(self.metadata)
+        failed_count = total - success_count
         
         # Save metadata
         self._print("=" * 60)
         self._print("Generating metadata...")
+        self._flush()
         self.save_metadata()
         
         # Summary
@@ -470,6 +580,9 @@ Examples:
   %(prog)s 'https://example.com/.../image01_large.jpg' 'images' -r 3 -s '_large'
   # Downloads: image01_large.jpg, image02_large.jpg, image03_large.jpg
   
+  # Limit concurrent downloads
+  %(prog)s 'https://example.com/page' 'images' -j 4
+  
   # Quiet mode
   %(prog)s 'https://example.com/page' 'images' -q
         """
@@ -485,6 +598,8 @@ Examples:
                         help='Download range (for numeric filenames, e.g., -r 3 downloads 3 images)')
     parser.add_argument('-s', '--suffix', dest='suffix',
                         help='Suffix after the number (e.g., -s "_500" for prefix_01_500.jpg)')
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Number of concurrent downloads (default: {DEFAULT_JOBS})')
     parser.add_argument('-q', '--quiet', action='store_true',
                         help='Quiet mode (minimal output)')
     parser.add_argument('-v', '--version', action='version', version='%(prog)s 1.4')
@@ -501,7 +616,8 @@ Examples:
         filenames=filenames,
         range_count=args.range_count,
         suffix=args.suffix,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        jobs=args.jobs
     )
     
     success, failed = downloader.download_all()
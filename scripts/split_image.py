@@ -2,99 +2,266 @@
 """
 Split composite images into individual sub-images.
 Usage: python split_image.py input output [options]
+
+Decoding and encoding dominate the run time; Pillow-SIMD is a drop-in
+replacement for Pillow with faster JPEG/WebP codecs and can be installed
+in its place.
 """
 
 import os
+import io
+import sys
+import logging
+import string
 import argparse
-from PIL import Image
+import threading
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from PIL import Image, ImageChops
 import numpy as np
 
+# Optional: compiled kernel for separator detection
+try:
+    from numba import config as numba_config, njit, prange, set_num_threads, threading_layer
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
 # Supported input formats
 INPUT_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tiff', '.gif'}
 
+# --suffix template variables, in positional order once compiled
+SUFFIX_FIELDS = ('name', 'row', 'col', 'n', 'N')
+
+
+# Rows handled per parallel block by the Numba kernel
+ROW_BLOCK = 64
+
+# Held around kernel calls; process_directory swaps in a real lock while
+# pool threads share a threading layer that is not thread-safe
+_kernel_lock = contextlib.nullcontext()
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _white_line_counts(arr, threshold, step):
+        """
+        Count white pixels (all channels > threshold) per row and per column,
+        sampling every `step`-th pixel along each line.
+        
+        Both counts come from one row-major pass over the pixels. Row blocks
+        run in parallel, each with its own column counters, so no two
+        threads ever update the same counter.
+        """
+        height, width, channels = arr.shape
+        n_blocks = (height + ROW_BLOCK - 1) // ROW_BLOCK
+        row_count = np.zeros(height, dtype=np.int64)
+        block_col_count = np.zeros((n_blocks, width), dtype=np.int64)
+        
+        for b in prange(n_blocks):
+            for i in range(b * ROW_BLOCK, min(height, (b + 1) * ROW_BLOCK)):
+                # Rows sampled for the column counts visit every pixel,
+                # the others only the pixels sampled for their own row count
+                col_sampled = i % step == 0
+                j_step = 1 if col_sampled else step
+                count = 0
+                for j in range(0, width, j_step):
+                    white = True
+                    for c in range(channels):
+                        if arr[i, j, c] <= threshold:
+                            white = False
+                            break
+                    if white:
+                        if j % step == 0:
+                            count += 1
+                        if col_sampled:
+                            block_col_count[b, j] += 1
+                row_count[i] = count
+        
+        return row_count, block_col_count.sum(axis=0)
+
+
+def white_pixel_mask(img, white_threshold):
+    """
+    Return an L-mode image that is 255 where every channel exceeds the threshold.
+    
+    Thresholding runs through Pillow's point() lookup table and the bands are
+    combined with a per-pixel minimum, so the RGB data never leaves C.
+    """
+    lut = [255 if value > white_threshold else 0 for value in range(256)]
+    bands = img.point(lut * len(img.getbands())).split()
+    mask = bands[0]
+    for band in bands[1:]:
+        mask = ImageChops.darker(mask, band)
+    return mask
+
 
-def trim_white_border(img_array, brightness_threshold=250, white_ratio=0.85, max_trim=10, sides="tblr"):
+def white_line_ratios(img, white_threshold, step=1):
+    """
+    Return the fraction of white pixels in each row and in each column.
+    
+    With step > 1 each line is sampled at every step-th pixel along its length.
+    Every row and column is still classified, so region boundaries stay exact.
+    """
+    width, height = img.size
+    
+    if njit is not None:
+        arr = np.asarray(img)
+        with _kernel_lock:
+            row_count, col_count = _white_line_counts(arr, white_threshold, step)
+    else:
+        # Without Numba, threshold in Pillow and count the 1-byte mask
+        mask = np.asarray(white_pixel_mask(img, white_threshold))
+        row_count = np.count_nonzero(mask[:, ::step], axis=1)
+        col_count = np.count_nonzero(mask[::step], axis=0)
+    
+    # Number of samples per row / column
+    return row_count / -(-width // step), col_count / -(-height // step)
+
+
+def bright_pixel_mask(img_array, brightness_threshold=250):
+    """Return a 2D bool mask of pixels whose mean brightness exceeds the threshold."""
+    # Integer sum instead of a float mean: mean > t  <=>  sum > 3t
+    return img_array.sum(axis=2, dtype=np.uint16) > brightness_threshold * 3
+
+
+def trim_white_border(bright_mask, white_ratio=0.85, max_trim=10, sides="tblr"):
     """
     Trim white borders from image edges.
     
     Args:
+        bright_mask: 2D bool array from bright_pixel_mask()
         sides: String containing which sides to trim:
                t=top, b=bottom, l=left, r=right
                e.g., "lr" = only left and right, "tblr" = all sides
     """
-    height, width = img_array.shape[:2]
+    height, width = bright_mask.shape
+    # A negative max_trim trims nothing rather than acting as a slice bound
+    max_rows = max(0, min(max_trim, height // 4))
+    max_cols = max(0, min(max_trim, width // 4))
     
-    def is_edge_white(pixels):
-        brightness = np.mean(pixels, axis=-1)
-        bright_pixel_ratio = np.mean(brightness > brightness_threshold)
-        return bright_pixel_ratio >= white_ratio
+    def white_run(line_ratios):
+        """Count the leading lines that are white enough to trim."""
+        not_white = np.flatnonzero(line_ratios < white_ratio)
+        return int(not_white[0]) if not_white.size else len(line_ratios)
     
     top = bottom = left = right = 0
     sides = sides.lower()
     
-    # Top
+    # Each side tests all of its candidate lines with one reduction,
+    # ordered from the edge inwards
     if 't' in sides:
-        for i in range(min(max_trim, height // 4)):
-            if is_edge_white(img_array[i, :, :]):
-                top = i + 1
-            else:
-                break
+        top = white_run(bright_mask[:max_rows].mean(axis=1))
     
-    # Bottom
     if 'b' in sides:
-        for i in range(min(max_trim, height // 4)):
-            if is_edge_white(img_array[height - 1 - i, :, :]):
-                bottom = i + 1
-            else:
-                break
+        bottom = white_run(bright_mask[height - max_rows:][::-1].mean(axis=1))
     
-    # Left
     if 'l' in sides:
-        for i in range(min(max_trim, width // 4)):
-            if is_edge_white(img_array[:, i, :]):
-                left = i + 1
-            else:
-                break
+        left = white_run(bright_mask[:, :max_cols].mean(axis=0))
     
-    # Right
     if 'r' in sides:
-        for i in range(min(max_trim, width // 4)):
-            if is_edge_white(img_array[:, width - 1 - i, :]):
-                right = i + 1
-            else:
-                break
+        right = white_run(bright_mask[:, width - max_cols:][:, ::-1].mean(axis=0))
     
     return top, bottom, left, right
 
 
+def find_regions(is_white, min_size=50, min_gap=3):
+    """
+    Find content regions along one axis.
+    
+    Args:
+        is_white: 1D bool array, True where the row/column is a separator
+    
+    Returns:
+        List of (start, end) ranges. Non-white runs separated by fewer than
+        min_gap white lines are merged; regions shorter than min_size are dropped.
+    """
+    # Run boundaries of the non-white runs, found in one vectorized pass
+    padded = np.concatenate(([True], is_white, [True])).astype(np.int8)
+    diff = np.diff(padded)
+    starts = np.flatnonzero(diff == -1)
+    ends = np.flatnonzero(diff == 1)
+    
+    regions = []
+    start = end = None
+    for run_start, run_end in zip(starts.tolist(), ends.tolist()):
+        if start is not None and run_start - end < min_gap:
+            end = run_end
+            continue
+        if start is not None and end - start >= min_size:
+            regions.append((start, end))
+        start, end = run_start, run_end
+    
+    if start is not None and end - start >= min_size:
+        regions.append((start, end))
+    
+    return regions
+
+
+def _positional_template(template):
+    """Rewrite the named SUFFIX_FIELDS in a format string as positional fields."""
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        
+        # Keep any attribute/index lookups, e.g. {name[0]}
+        key_end = min([i for i in (field.find('.'), field.find('[')) if i >= 0] or [len(field)])
+        key = field[:key_end]
+        if key not in SUFFIX_FIELDS:
+            raise ValueError(f"unknown template field {{{key}}}")
+        
+        parts.append('{' + str(SUFFIX_FIELDS.index(key)) + field[key_end:])
+        if conversion:
+            parts.append('!' + conversion)
+        if spec:
+            # Format specs may nest fields, e.g. {n:0{N}}
+            parts.append(':' + _positional_template(spec))
+        parts.append('}')
+    return ''.join(parts)
+
+
+def compile_suffix_template(template):
+    """
+    Compile a --suffix template into a callable taking (name, row, col, n, N).
+    
+    The template is parsed once; each call is a positional str.format on the
+    rewritten string. Raises ValueError for malformed templates or unknown fields.
+    """
+    return _positional_template(template).format
+
+
 def generate_output_filename(base_name, row, col, total_cols, suffix_template, suffix_list):
-    """Generate output filename based on template or suffix list."""
+    """
+    Generate output filename based on template or suffix list.
+    
+    suffix_template is a callable from compile_suffix_template().
+    """
     n = row * total_cols + col
     
     if suffix_list:
         suffix = suffix_list[n % len(suffix_list)]
         return f"{base_name}{suffix}"
     
-    return suffix_template.format(
-        name=base_name,
-        row=row,
-        col=col,
-        n=n,
-        N=n + 1
-    )
+    return suffix_template(base_name, row, col, n, n + 1)
 
 
-def save_image(img, output_path, output_format, quality=95):
+def save_image(img, output_path, output_format, quality=95, webp_method=4):
     """Save image in specified format."""
     format_lower = output_format.lower().lstrip('.')
     
     if format_lower in ('jpg', 'jpeg'):
-        img = img.convert('RGB')
+        # convert() copies even when the mode already matches
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
         img.save(output_path, 'JPEG', quality=quality)
     elif format_lower == 'png':
         img.save(output_path, 'PNG')
     elif format_lower == 'webp':
-        img.save(output_path, 'WEBP', quality=quality)
+        # method: 0 = fastest encode, 6 = smallest file
+        img.save(output_path, 'WEBP', quality=quality, method=webp_method)
     else:
         img.save(output_path, quality=quality)
 
@@ -104,76 +271,55 @@ def split_composite_image(image_path, output_dir, white_threshold=245,
                           trim=False, trim_max=10, trim_threshold=248,
                           trim_sides="tblr",
                           suffix_template="{name}_{row}_{col}",
-                          suffix_list=None, output_format="jpg", quality=95):
+                          suffix_list=None, output_format="jpg", quality=95,
+                          detect_step=1, webp_method=4):
     """Split a composite image into individual sub-images."""
-    img = Image.open(image_path).convert('RGB')
-    arr = np.array(img)
-    height, width = arr.shape[:2]
-    
-    def is_white_column(col):
-        column_pixels = arr[:, col, :]
-        pixel_is_white = np.all(column_pixels > white_threshold, axis=1)
-        return np.mean(pixel_is_white) >= white_ratio
-    
-    def is_white_row(row):
-        row_pixels = arr[row, :, :]
-        pixel_is_white = np.all(row_pixels > white_threshold, axis=1)
-        return np.mean(pixel_is_white) >= white_ratio
-    
-    def find_regions(axis_size, is_white_func):
-        is_white = [is_white_func(i) for i in range(axis_size)]
-        
-        regions = []
-        in_region = False
-        start = 0
-        
-        for i in range(axis_size):
-            if not is_white[i] and not in_region:
-                start = i
-                in_region = True
-            elif is_white[i] and in_region:
-                gap_end = i
-                while gap_end < axis_size and is_white[gap_end]:
-                    gap_end += 1
-                
-                if gap_end - i >= min_gap or gap_end == axis_size:
-                    if i - start >= min_size:
-                        regions.append((start, i))
-                    in_region = False
-        
-        if in_region and axis_size - start >= min_size:
-            regions.append((start, axis_size))
-        
-        return regions
+    if isinstance(suffix_template, str):
+        suffix_template = compile_suffix_template(suffix_template)
+    
+    img = Image.open(image_path)
+    # convert() always copies, even when the image is already RGB
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    width, height = img.size
+    
+    # Classify every column and row at once
+    row_ratio, col_ratio = white_line_ratios(img, white_threshold, detect_step)
+    col_white = col_ratio >= white_ratio
+    row_white = row_ratio >= white_ratio
     
-    h_regions = find_regions(width, is_white_column)
-    v_regions = find_regions(height, is_white_row)
+    h_regions = find_regions(col_white, min_size, min_gap)
+    v_regions = find_regions(row_white, min_size, min_gap)
     
     if not v_regions:
         v_regions = [(0, height)]
     if not h_regions:
         h_regions = [(0, width)]
     
-    print(f"  Detected {len(h_regions)} cols x {len(v_regions)} rows")
+    logger.info(f"  Detected {len(h_regions)} cols x {len(v_regions)} rows")
     
     total_images = len(h_regions) * len(v_regions)
     if suffix_list and len(suffix_list) < total_images:
-        print(f"  Warning: suffix list ({len(suffix_list)}) < slices ({total_images}), will cycle")
+        logger.warning(f"  Warning: suffix list ({len(suffix_list)}) < slices ({total_images}), will cycle")
     
     os.makedirs(output_dir, exist_ok=True)
     base_name = os.path.splitext(os.path.basename(image_path))[0]
     output_ext = f".{output_format.lower().lstrip('.')}"
     
+    # Per-image constants for the crop loop
+    total_cols = len(h_regions)
+    output_prefix = os.path.join(output_dir, "")
+    
     count = 0
     for vi, (y1, y2) in enumerate(v_regions):
         for hi, (x1, x2) in enumerate(h_regions):
             crop_x1, crop_y1, crop_x2, crop_y2 = x1, y1, x2, y2
+            cropped = img.crop((x1, y1, x2, y2))
             
             if trim:
-                sub_arr = arr[y1:y2, x1:x2, :]
+                # Only the sub-image's pixels are ever copied into NumPy
                 top, bottom, left, right = trim_white_border(
-                    sub_arr, 
-                    brightness_threshold=trim_threshold,
+                    bright_pixel_mask(np.asarray(cropped), trim_threshold),
                     white_ratio=0.80,
                     max_trim=trim_max,
                     sides=trim_sides
@@ -184,68 +330,174 @@ def split_composite_image(image_path, output_dir, white_threshold=245,
                 crop_y2 -= bottom
                 
                 trim_info = ""
-                if any([top, bottom, left, right]):
+                if top or bottom or left or right:
                     trim_info = f" (trim: T{top} B{bottom} L{left} R{right})"
+                    # Cut the trimmed box straight from the decoded image
+                    cropped = img.crop((crop_x1, crop_y1, crop_x2, crop_y2))
             else:
                 trim_info = ""
             
-            cropped = img.crop((crop_x1, crop_y1, crop_x2, crop_y2))
-            
             output_name = generate_output_filename(
-                base_name, vi, hi, len(h_regions), 
+                base_name, vi, hi, total_cols,
                 suffix_template, suffix_list
             )
-            output_path = os.path.join(output_dir, output_name + output_ext)
+            output_path = output_prefix + output_name + output_ext
             
-            save_image(cropped, output_path, output_format, quality)
+            save_image(cropped, output_path, output_format, quality, webp_method)
             count += 1
             
             final_w = crop_x2 - crop_x1
             final_h = crop_y2 - crop_y1
-            print(f"    [{vi},{hi}] {final_w}x{final_h}{trim_info} -> {output_name}{output_ext}")
+            # Lazy %-formatting: nothing is formatted unless DEBUG is enabled
+            logger.debug("    [%d,%d] %dx%d%s -> %s%s", vi, hi, final_w, final_h,
+                         trim_info, output_name, output_ext)
     
     return count
 
 
-def process_directory(input_dir, output_dir, recursive=False, **kwargs):
-    """Process images in a directory."""
+def find_images(input_dir, output_dir, recursive=False):
+    """List (image_path, output_dir, display_name) for every image to process."""
+    tasks = []
+    pending = [""]  # Directories left to scan, relative to input_dir
+    
+    # Depth-first walk with os.scandir, whose entries carry their file type
+    while pending:
+        rel_path = pending.pop()
+        current_output_dir = os.path.join(output_dir, rel_path) if rel_path else output_dir
+        
+        try:
+            with os.scandir(os.path.join(input_dir, rel_path)) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            if not recursive:
+                raise
+            # Skip unreadable directories, as os.walk does
+            continue
+        
+        for entry in entries:
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in INPUT_EXTENSIONS:
+                tasks.append((entry.path, current_output_dir, os.path.join(rel_path, entry.name)))
+        
+        if recursive:
+            # Reversed so subdirectories are popped in name order
+            pending.extend(os.path.join(rel_path, entry.name) for entry in reversed(entries)
+                           if entry.is_dir(follow_symlinks=False))
+    
+    return tasks
+
+
+def _split_worker(image_path, output_dir, kwargs, log_level, kernel_threads=1):
+    """Run split_composite_image in a worker process, returning (count, output)."""
+    if njit is not None:
+        # Share the cores between worker processes instead of each
+        # starting a Numba thread per core
+        set_num_threads(kernel_threads)
+    
+    # Capture the log so it prints as one block per image
+    output = io.StringIO()
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(log_level)
+    logger.propagate = False
+    try:
+        count = split_composite_image(image_path, output_dir, **kwargs)
+    finally:
+        logger.removeHandler(handler)
+    return count, output.getvalue()
+
+
+class _ThreadLogCapture(logging.Filter):
+    """Divert records logged by pool threads into per-thread buffers."""
+    
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+        self._formatter = logging.Formatter('%(message)s')
+    
+    def filter(self, record):
+        lines = getattr(self._local, 'lines', None)
+        if lines is None:
+            return True
+        lines.append(self._formatter.format(record) + '\n')
+        return False
+    
+    def run(self, image_path, output_dir, kwargs):
+        """Run split_composite_image in the calling thread, returning (count, output)."""
+        self._local.lines = lines = []
+        try:
+            count = split_composite_image(image_path, output_dir, **kwargs)
+        finally:
+            self._local.lines = None
+        return count, ''.join(lines)
+
+
+def process_directory(input_dir, output_dir, recursive=False, jobs=1, threads=False, **kwargs):
+    """Process images in a directory, using up to `jobs` worker processes (or threads)."""
+    global _kernel_lock
+    tasks = find_images(input_dir, output_dir, recursive)
     total = 0
     
-    if recursive:
-        for root, dirs, files in os.walk(input_dir):
-            rel_path = os.path.relpath(root, input_dir)
-            if rel_path == ".":
-                rel_path = ""
-            
-            current_output_dir = os.path.join(output_dir, rel_path) if rel_path else output_dir
-            
-            image_files = [f for f in sorted(files) 
-                          if os.path.splitext(f)[1].lower() in INPUT_EXTENSIONS]
-            
-            if image_files:
-                if rel_path:
-                    print(f"\n[Dir] {rel_path}")
-                
-                for filename in image_files:
-                    image_path = os.path.join(root, filename)
-                    print(f"Processing: {filename}")
-                    count = split_composite_image(
-                        image_path, 
-                        current_output_dir, 
-                        **kwargs
-                    )
-                    total += count
+    if jobs <= 1 or len(tasks) <= 1:
+        for image_path, current_output_dir, name in tasks:
+            logger.info(f"Processing: {name}")
+            total += split_composite_image(image_path, current_output_dir, **kwargs)
+        return total
+    
+    kernel_lock = contextlib.nullcontext()
+    if threads:
+        # Pillow releases the GIL while decoding and encoding, so threads
+        # overlap most of the work without process start-up and pickling
+        if njit is not None:
+            # Start Numba's thread pool from the main thread; when a worker
+            # thread starts it first, the TBB layer hangs at interpreter exit
+            _white_line_counts(np.asarray(Image.new('RGB', (1, 1))), 255, 1)
+            if threading_layer() == 'workqueue':
+                # The workqueue layer aborts on concurrent parallel launches
+                kernel_lock = threading.Lock()
+        capture = _ThreadLogCapture()
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        
+        def submit(image_path, current_output_dir):
+            return executor.submit(capture.run, image_path, current_output_dir, kwargs)
     else:
-        for filename in sorted(os.listdir(input_dir)):
-            if os.path.splitext(filename)[1].lower() in INPUT_EXTENSIONS:
-                image_path = os.path.join(input_dir, filename)
-                print(f"Processing: {filename}")
-                count = split_composite_image(
-                    image_path,
-                    output_dir,
-                    **kwargs
-                )
-                total += count
+        # Each image is independent and decode/split/encode is CPU-bound.
+        # Read the thread budget from the config: querying Numba's pool here
+        # would start it in the parent before the workers fork
+        capture = None
+        log_level = logger.getEffectiveLevel()
+        kernel_threads = max(1, numba_config.NUMBA_NUM_THREADS // jobs) if njit is not None else 1
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        
+        def submit(image_path, current_output_dir):
+            return executor.submit(_split_worker, image_path, current_output_dir,
+                                   kwargs, log_level, kernel_threads)
+    
+    previous_lock, _kernel_lock = _kernel_lock, kernel_lock
+    if capture is not None:
+        logger.addFilter(capture)
+    try:
+        with executor:
+            try:
+                futures = {
+                    submit(image_path, current_output_dir): name
+                    for image_path, current_output_dir, name in tasks
+                }
+                for future in as_completed(futures):
+                    count, output = future.result()
+                    logger.info(f"Processing: {futures[future]}")
+                    if output:
+                        sys.stdout.write(output)
+                    total += count
+            except BaseException:
+                # Stop at the first failure or Ctrl-C instead of
+                # finishing every queued image first
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        _kernel_lock = previous_lock
+        if capture is not None:
+            logger.removeFilter(capture)
     
     return total
 
@@ -299,6 +551,9 @@ Examples:
   %(prog)s input.jpg output --trim --trim-sides lr
   %(prog)s ./input ./output -R --trim --trim-sides lrb
   %(prog)s ./input ./output -R --suffixes="_a,_b,_c" -e webp -q 90
+  %(prog)s ./input ./output -R -j 4
+  %(prog)s ./input ./output -R -j 4 --threads
+  %(prog)s input.jpg output -v
         '''
     )
     
@@ -318,6 +573,9 @@ Examples:
                         help='Minimum separator width in pixels, default: 3')
     parser.add_argument('-r', '--white-ratio', type=float, default=0.99,
                         help='White pixel ratio threshold for separator detection, default: 0.99')
+    parser.add_argument('--detect-step', type=int, default=1,
+                        help='Sample every Nth pixel along each row/column when detecting '
+                             'separators; faster on large images, default: 1 (every pixel)')
     
     # Border trimming
     parser.add_argument('--trim', action='store_true',
@@ -329,6 +587,16 @@ Examples:
     parser.add_argument('--trim-sides', type=str, default="tblr",
                         help='Sides to trim: t(top), b(bottom), l(left), r(right), default: tblr')
     
+    # Output
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='List every extracted sub-image')
+    
+    # Parallelism
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of images processed in parallel, default: CPU count')
+    parser.add_argument('--threads', action='store_true',
+                        help='Run parallel jobs in threads instead of processes')
+    
     # Output naming
     naming_group = parser.add_mutually_exclusive_group()
     naming_group.add_argument('--suffixes', type=str, default=None,
@@ -342,29 +610,45 @@ Examples:
                         help='Output format: jpg, png, webp (default: webp)')
     parser.add_argument('-q', '--quality', type=int, default=95,
                         help='Output quality for jpg/webp (1-100), default: 95')
+    parser.add_argument('--webp-method', type=int, default=4, choices=range(7),
+                        metavar='{0-6}',
+                        help='WebP encoder effort: 0 is fastest, 6 gives the smallest files, default: 4')
     
     args = parser.parse_args()
     
+    logging.basicConfig(stream=sys.stdout, format='%(message)s', level=logging.INFO)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    
     # Validate trim-sides
     valid_sides = set('tblr')
     if not all(c in valid_sides for c in args.trim_sides.lower()):
         parser.error(f"--trim-sides must only contain t, b, l, r (got: {args.trim_sides})")
     
+    if args.detect_step < 1:
+        parser.error(f"--detect-step must be at least 1 (got: {args.detect_step})")
+    
     suffix_list = parse_suffix_list(args.suffixes)
     
+    try:
+        suffix_template = compile_suffix_template(args.suffix)
+    except ValueError as e:
+        parser.error(f"invalid --suffix template {args.suffix!r}: {e}")
+    
     common_args = {
         'white_threshold': args.threshold,
         'min_size': args.min_size,
         'min_gap': args.min_gap,
         'white_ratio': args.white_ratio,
+        'detect_step': args.detect_step,
         'trim': args.trim,
         'trim_max': args.trim_max,
         'trim_threshold': args.trim_t,
         'trim_sides': args.trim_sides,
-        'suffix_template': args.suffix,
+        'suffix_template': suffix_template,
         'suffix_list': suffix_list,
         'output_format': args.format,
         'quality': args.quality,
+        'webp_method': args.webp_method,
     }
     
     # Format trim sides for display
@@ -381,6 +665,7 @@ Examples:
     print(f"Output: {args.output}")
     print(f"Format: {args.format.upper()} (quality: {args.quality})")
     print(f"Recursive: {'Yes' if args.recursive else 'No'}")
+    print(f"Jobs: {args.jobs} ({'threads' if args.threads else 'processes'})")
     if args.trim:
         print(f"Trim: {', '.join(sides_display)}")
     else:
@@ -401,6 +686,8 @@ Examples:
             args.input, 
             args.output, 
             recursive=args.recursive,
+            jobs=args.jobs,
+            threads=args.threads,
             **common_args
         )
         print(f"\n{'='*50}")